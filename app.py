@@ -1,46 +1,173 @@
+import os
+import re
+import hashlib
+import tempfile
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
 from datetime import date
 
+# Copy-on-Write (always on from pandas 3): column selections and other derived
+# frames copy lazily, only if written; row takes such as dff still copy
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # -------------------- Page --------------------
 st.set_page_config(page_title="Service Calls Dashboard", layout="wide")
 
 # -------------------- Config --------------------
 FILE_NAME = "CALL RECORDS 2026.xlsx"  # in repo root
+CACHE_DIR = os.path.join(".cache", "call-records")  # parsed copies of the workbook
+# Bump whenever read_sheet() changes what it stores, so old copies are not reused
+CACHE_FORMAT = 2
+# Files read_sheet() writes there: <content hash>.v<format>.parquet and its temp files
+CACHE_FILE_RE = re.compile(r"[0-9a-f]{16}\.(.+\.)?(parquet|tmp)")
 
 DATE_COL = "DATE"
 CUSTOMER_COL = "CUSTOMER"
 STATUS_COL = "CALL STATUS"           # will be auto-mapped if different
 TECH_COL = "TECH 1"
 CALL_ID_COL = "TD REPORT NO."
+CALL_ID_CODE_COL = "_CALL_ID_CODE"  # int32 factorized call id, added by load_data()
+
+# Status cell values that mean "no status" (after strip + upper)
+BLANK_STATUSES = ["", "NAN", "NONE", "NULL", "(BLANK)"]
+
+# Other header spellings accepted for each configured column
+COL_ALIASES = {
+    "CALL STATUS": ["STATUS", "CALLSTATUS", "CALL_STATUS", "CALL  STATUS", "CALL-STATUS"],
+    "TECH 1": ["TECH1", "TECH  1", "TECHNICIAN", "TECH"],
+    "TD REPORT NO.": ["TD REPORT NO", "TD_REPORT_NO", "REPORT NO", "REPORT NO."],
+    "DATE": ["CALL DATE", "SERVICE DATE"],
+    "CUSTOMER": ["CLIENT", "CUSTOMER NAME"],
+}
 
 # -------------------- Helpers --------------------
+def norm_name(name):
+    """Header/config name as compared: trimmed, upper case, single spaces."""
+    return " ".join(str(name).strip().upper().split())
+
+# Normalized once at import, not on every ensure_col() call
+NORMALIZED_ALIASES = {norm_name(k): [norm_name(a) for a in v] for k, v in COL_ALIASES.items()}
+
+def read_sheet():
+    """
+    Raw call sheet with normalized headers (cached Parquet copy if the xlsx bytes match).
+    Returns (df, digest); digest is the workbook content hash, i.e. the data version.
+    """
+    # Cold starts read the Parquet copy of this exact workbook content
+    with open(FILE_NAME, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    cache_name = f"{digest}.v{CACHE_FORMAT}.parquet"
+    cache_path = os.path.join(CACHE_DIR, cache_name)
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path), digest
+        except (OSError, ValueError):
+            # Unreadable copy (e.g. truncated): drop it and rebuild from the xlsx
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+    # calamine (Rust) parses the sheet far faster than the default openpyxl
+    try:
+        df = pd.read_excel(FILE_NAME, engine="calamine")
+    except ImportError:
+        df = pd.read_excel(FILE_NAME, engine="openpyxl")  # deploy without the wheel
+    df.columns = [norm_name(c) for c in df.columns]
+
+    # Text columns as a string dtype (also makes mixed time/number/text cells
+    # Arrow-writable); dates already arrive as datetime64 from the reader
+    df = df.astype({c: "string[pyarrow]" for c in df.columns[df.dtypes == object]})
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename, so no reader ever sees a partial copy
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f"{cache_name}.", suffix=".tmp")
+        os.close(fd)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; keep the usual cache mode
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        for name in os.listdir(CACHE_DIR):  # our files from older workbooks or formats
+            if CACHE_FILE_RE.fullmatch(name) and not name.startswith(cache_name):
+                try:
+                    os.remove(os.path.join(CACHE_DIR, name))
+                except OSError:
+                    pass  # e.g. already removed by another worker
+    except OSError:
+        pass  # read-only checkout: run without the cache
+    return df, digest
+
 @st.cache_data(ttl=300)
 def load_data():
-    df = pd.read_excel(FILE_NAME)
-    df.columns = [" ".join(str(c).strip().upper().split()) for c in df.columns]
-    return df
-
-def ensure_col(df, want):
-    """Return actual column name in df that matches want or known aliases."""
-    want_n = " ".join(want.strip().upper().split())
-    if want_n in df.columns:
-        return want_n
-
-    aliases = {
-        "CALL STATUS": ["STATUS", "CALLSTATUS", "CALL_STATUS", "CALL  STATUS", "CALL-STATUS"],
-        "TECH 1": ["TECH1", "TECH  1", "TECHNICIAN", "TECH"],
-        "TD REPORT NO.": ["TD REPORT NO", "TD_REPORT_NO", "REPORT NO", "REPORT NO."],
-        "DATE": ["CALL DATE", "SERVICE DATE"],
-        "CUSTOMER": ["CLIENT", "CUSTOMER NAME"],
-    }
+    """
+    Read, clean and summarize the sheet once per TTL window (not per rerun).
+    Returns (df, data_version, cols, customer_options, tech_options, min_date, max_date);
+    data_version is the workbook content hash df was built from, and cols maps
+    each configured column name to the real one, or None if missing.
+    """
+    df, data_version = read_sheet()
 
-    for a in aliases.get(want_n, []):
-        a_n = " ".join(a.strip().upper().split())
-        if a_n in df.columns:
-            return a_n
+    # Resolve real column names (avoid KeyError) via one normalized-name lookup
+    col_lookup = {norm_name(c): c for c in df.columns}
+    cols = {c: ensure_col(col_lookup, c) for c in (DATE_COL, CUSTOMER_COL, STATUS_COL, TECH_COL, CALL_ID_COL)}
+    date_col, cust_col, status_col, tech_col = (
+        cols[c] for c in (DATE_COL, CUSTOMER_COL, STATUS_COL, TECH_COL)
+    )
+    if None in (date_col, cust_col, status_col):
+        return df, data_version, cols, [], None, None, None  # caller reports the missing columns
+
+    # Parse date (Excel date cells already arrive as datetime64; text cells are ISO)
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        df[date_col] = pd.to_datetime(df[date_col], format="ISO8601", errors="coerce")
+    # Sorted by date so the range filter can slice with searchsorted
+    df = df.dropna(subset=[date_col]).sort_values(date_col, kind="stable", ignore_index=True)
+
+    # Normalize fields
+    # Status: strip + upper as Arrow string kernels, then one isin mask for the blank spellings
+    s = df[status_col].astype("string[pyarrow]").str.strip().str.upper()
+    df[status_col] = s.where(~s.isin(BLANK_STATUSES) & s.notna(), "BLANK")
+    # Text keys: Arrow strip, empty -> missing
+    for c in (cust_col, tech_col):
+        if c:
+            t = df[c].astype("string[pyarrow]").str.strip()
+            df[c] = t.mask(t.eq("") | t.isna(), pd.NA)
+
+    # ✅ Keep ONLY rows where status is actually filled, with the low-cardinality
+    # keys as categoricals (masks/groupbys run on integer codes)
+    df = df[df[status_col] != "BLANK"].astype(
+        {c: "category" for c in (status_col, cust_col, tech_col) if c}
+    )
+
+    # Call ids as int32 codes (-1 = missing) so the distinct count skips string hashing
+    if cols[CALL_ID_COL]:
+        df[CALL_ID_CODE_COL] = pd.factorize(df[cols[CALL_ID_COL]])[0].astype(np.int32)
+
+    # Sidebar inputs, already in display order, so reruns don't rescan or re-sort
+    customer_options = sorted(df[cust_col].dropna().unique().tolist(), key=lambda s: str(s).lower())
+    tech_options = (
+        sorted(df[tech_col].dropna().unique().tolist(), key=lambda s: str(s).lower()) if tech_col else None
+    )
+    min_date = df[date_col].min().date()
+    max_date = df[date_col].max().date()
 
+    return df, data_version, cols, customer_options, tech_options, min_date, max_date
+
+def ensure_col(col_lookup, want):
+    """
+    Return the actual column name matching want or a known alias, or None.
+    col_lookup maps normalized column names to the real ones.
+    """
+    want_n = norm_name(want)
+    for name in [want_n] + NORMALIZED_ALIASES.get(want_n, []):
+        if name in col_lookup:
+            return col_lookup[name]
     return None
 
 def status_palette():
@@ -51,31 +178,162 @@ def status_palette():
         "BLANK": "#BDBDBD",
     }
 
-def normalize_status(s):
-    # Treat truly empty + whitespace-only as blank
-    if pd.isna(s):
-        return "BLANK"
-    s = str(s).strip().upper()
-    if s in ["", "NAN", "NONE", "NULL", "(BLANK)"]:
-        return "BLANK"
-    return s
-
-def normalize_text(x):
-    if pd.isna(x):
-        return None
-    x = str(x).strip()
-    return x if x else None
+def codes_and_labels(s):
+    """Integer codes (-1 = missing) and labels; categoricals reuse their codes."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.codes.to_numpy(), s.cat.categories
+    return pd.factorize(s, sort=True)
+
+def pair_counts(a, b):
+    """
+    Count rows per (a, b) pair in one pass over integer codes.
+    Returns a frame indexed by the observed labels of a, one column per label of b.
+    """
+    a_codes, a_labels = codes_and_labels(a)
+    b_codes, b_labels = codes_and_labels(b)
+    ok = (a_codes >= 0) & (b_codes >= 0)  # like groupby, skip missing keys
+    flat = a_codes[ok].astype(np.int64) * len(b_labels) + b_codes[ok]
+    counts = np.bincount(flat, minlength=len(a_labels) * len(b_labels))
+    counts = counts.reshape(len(a_labels), len(b_labels)).astype(np.int32)  # counts fit easily
+    seen = counts.any(axis=1)  # categories can include labels absent from this slice
+    return pd.DataFrame(counts[seen], index=a_labels[seen], columns=b_labels)
+
+@st.cache_data(ttl=300, max_entries=64)
+def daily_status_counts(_frame, filter_key):
+    """
+    Calls per (day, status) for the filtered frame. _frame is not hashed:
+    filter_key must identify it (data version of df + every filter value).
+    Week/Month views roll up from this instead of regrouping the raw rows.
+    """
+    day = _frame[DATE_COL].values.astype("datetime64[D]")
+    return (
+        pd.DataFrame({"DAY": day, STATUS_COL: _frame[STATUS_COL].values})
+        .groupby(["DAY", STATUS_COL], observed=True, sort=False)
+        .size()
+        .astype("int32")  # per-day counts are small; halves the cached frame
+        .reset_index(name="COUNT")
+    )
+
+@st.cache_data(ttl=300, max_entries=64)
+def tech_chart_inputs(_frame, filter_key, statuses):
+    """
+    (traces, order) for the technician chart: per-status count traces, and
+    technicians by completion rate (best first). _frame is not hashed:
+    filter_key must identify it (data version of df + every filter value).
+    """
+    # tech x status count matrix, built with a single bincount
+    pivot = pair_counts(_frame[TECH_COL], _frame[STATUS_COL])
+
+    rates = pd.DataFrame({
+        "TOTAL": pivot.sum(axis=1),
+        "COMPLETED": pivot["COMPLETED"] if "COMPLETED" in pivot.columns else 0,
+    })
+    rates["COMP_RATE"] = rates["COMPLETED"] / rates["TOTAL"].where(rates["TOTAL"] != 0, 1)
+    # Single C-level argsort on the rate array; stable so ties keep name order
+    order_idx = np.argsort(-rates["COMP_RATE"].values, kind="stable")
+    order = rates.index.values[order_idx].tolist()
+
+    return matrix_traces(pivot, statuses), tuple(order)
+
+def bucket_labels(keys, fmt):
+    """
+    Label datetime64 bucket keys with strftime, formatting each distinct bucket once.
+    Returns (sorted unique labels, label per row).
+    """
+    uniq, inv = np.unique(keys, return_inverse=True)
+    labels = pd.DatetimeIndex(uniq).strftime(fmt).tolist()
+    return labels, np.asarray(labels, dtype=object)[inv]
+
+def matrix_traces(counts, statuses):
+    """
+    ((status, labels, counts), ...) for each status column of a label x status
+    count matrix, keeping only nonzero cells; statuses sets the trace order.
+    """
+    traces = []
+    for s in statuses:
+        if s not in counts.columns:
+            continue
+        col = counts[s].values
+        nz = col > 0
+        if nz.any():
+            traces.append((s, tuple(counts.index[nz].tolist()), tuple(col[nz].tolist())))
+    return tuple(traces)
+
+# Figure builders take small hashable tuples, so repeat inputs return a cached figure.
+# They cache fig.to_dict(): st.cache_data unpickles each hit, and a plain dict
+# unpickles far faster than a go.Figure, which re-validates every property.
+@st.cache_data(max_entries=64)
+def build_pie(labels, values):
+    colors = status_palette()
+    fig = go.Figure(
+        go.Pie(
+            labels=list(labels),
+            values=np.asarray(values),
+            marker=dict(colors=[colors.get(s) for s in labels]),
+            sort=False,  # keep status_order, as px category_orders did
+            direction="clockwise",
+        )
+    )
+    fig.update_layout(
+        legend_title_text="",
+        legend=dict(font=dict(size=14)),
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64)
+def build_trend(traces, xorder, tickvals, ticktext):
+    """Stacked bars per period; traces is ((status, periods, counts), ...)."""
+    colors = status_palette()
+    fig = go.Figure()
+    for s, x, y in traces:
+        fig.add_bar(x=list(x), y=np.asarray(y), name=s, marker_color=colors.get(s))
+
+    fig.update_layout(
+        barmode="stack",
+        legend_title_text="",
+        legend=dict(font=dict(size=14)),
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+    fig.update_xaxes(
+        categoryorder="array",
+        categoryarray=list(xorder),
+        tickmode="array",
+        tickvals=list(tickvals),
+        ticktext=list(ticktext),
+        title_text="",
+    )
+    fig.update_yaxes(title_text="Count")
+    return fig.to_dict()
+
+@st.cache_data(max_entries=64)
+def build_tech(traces, order):
+    """Horizontal stacked bars per technician; traces is ((status, techs, counts), ...)."""
+    colors = status_palette()
+    fig = go.Figure()
+    for s, y, x in traces:
+        fig.add_bar(y=list(y), x=np.asarray(x), name=s, orientation="h", marker_color=colors.get(s))
+
+    fig.update_layout(
+        barmode="stack",
+        legend_title_text="",
+        legend=dict(font=dict(size=14)),
+        margin=dict(l=10, r=10, t=10, b=10),
+        yaxis_title="",
+        xaxis_title="Count",
+    )
+    # Horizontal category axes draw bottom-up; reverse so the best rate sits on top
+    fig.update_yaxes(categoryorder="array", categoryarray=list(order)[::-1])
+    return fig.to_dict()
 
 def multiselect_with_all(label, options, default_all=True, key=None):
     """
     Multiselect with (All). If (All) selected (or user selects nothing),
     return None => meaning DON'T filter this field.
+    options come from load_data() already cleaned and sorted.
     """
-    options = [o for o in options if o is not None]
-    options_sorted = sorted(options, key=lambda s: str(s).lower())
-
     all_label = "(All)"
-    ui_options = [all_label] + options_sorted
+    ui_options = [all_label] + options
     default = [all_label] if default_all else []
 
     chosen = st.multiselect(label, ui_options, default=default, key=key)
@@ -84,15 +342,26 @@ def multiselect_with_all(label, options, default_all=True, key=None):
         return None  # IMPORTANT: no filtering
     return chosen
 
+def code_table(s, selected):
+    """
+    Bool lookup indexed by the category codes of s: True for selected labels.
+    The extra trailing False makes missing keys (code -1) never match.
+    """
+    cats = s.cat.categories
+    table = np.zeros(len(cats) + 1, dtype=bool)
+    pos = cats.get_indexer(selected)
+    table[pos[pos >= 0]] = True
+    return table
+
 # -------------------- Load --------------------
-df = load_data()
+df, data_version, cols, customer_options, tech_options, min_d, max_d = load_data()
 
-# Resolve real column names (avoid KeyError)
-DATE_COL_REAL = ensure_col(df, DATE_COL)
-CUSTOMER_COL_REAL = ensure_col(df, CUSTOMER_COL)
-STATUS_COL_REAL = ensure_col(df, STATUS_COL)
-TECH_COL_REAL = ensure_col(df, TECH_COL)
-CALL_ID_COL_REAL = ensure_col(df, CALL_ID_COL)  # can be None if not present
+# Real column names as resolved by load_data
+DATE_COL_REAL = cols[DATE_COL]
+CUSTOMER_COL_REAL = cols[CUSTOMER_COL]
+STATUS_COL_REAL = cols[STATUS_COL]
+TECH_COL_REAL = cols[TECH_COL]
+CALL_ID_COL_REAL = cols[CALL_ID_COL]  # can be None if not present
 
 missing = [name for name, real in [
     ("DATE", DATE_COL_REAL),
@@ -112,19 +381,6 @@ STATUS_COL = STATUS_COL_REAL
 TECH_COL = TECH_COL_REAL
 CALL_ID_COL = CALL_ID_COL_REAL  # may be None
 
-# Parse date
-df[DATE_COL] = pd.to_datetime(df[DATE_COL], errors="coerce")
-df = df.dropna(subset=[DATE_COL]).copy()
-
-# Normalize fields
-df[STATUS_COL] = df[STATUS_COL].apply(normalize_status)
-df[CUSTOMER_COL] = df[CUSTOMER_COL].apply(normalize_text)
-if TECH_COL and TECH_COL in df.columns:
-    df[TECH_COL] = df[TECH_COL].apply(normalize_text)
-
-# ✅ Keep ONLY rows where status is actually filled
-df = df[df[STATUS_COL] != "BLANK"].copy()
-
 # -------------------- Sidebar (wider) --------------------
 st.markdown(
     """
@@ -136,19 +392,16 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-colors = status_palette()
 status_order = ["COMPLETED", "ATTENDED", "NOT ATTENDED"]
 
 with st.sidebar:
     st.markdown("## Filters")
 
     # Customers (All = no filter; blanks in CUSTOMER will still be included)
-    customer_options = df[CUSTOMER_COL].dropna().unique().tolist()
     sel_customers = multiselect_with_all("Customer", customer_options, default_all=True, key="cust_multi")
 
     # Technicians (All = no filter; blanks in TECH will still be included)
-    if TECH_COL and TECH_COL in df.columns:
-        tech_options = df[TECH_COL].dropna().unique().tolist()
+    if tech_options is not None:
         sel_techs = multiselect_with_all("Technician", tech_options, default_all=True, key="tech_multi")
     else:
         sel_techs = None
@@ -157,9 +410,6 @@ with st.sidebar:
     status_dropdown = ["(All)"] + status_order
     sel_status = st.selectbox("Status", status_dropdown, index=0)
 
-    min_d = df[DATE_COL].min().date()
-    max_d = df[DATE_COL].max().date()
-
     # ✅ End date shows TODAY in UI
     today = date.today()
     if st.session_state.get("_end_date_last_set") != today:
@@ -177,71 +427,82 @@ with st.sidebar:
 # ✅ Filtering cannot go beyond your actual data max date
 d2 = min(d2_ui, max_d)
 
-mask = (df[DATE_COL].dt.date >= d1) & (df[DATE_COL].dt.date <= d2)
+# df is date-sorted: two binary searches give the range, no full-column compare
+lo, hi = df[DATE_COL].values.searchsorted(
+    [np.datetime64(d1), np.datetime64(d2) + np.timedelta64(1, "D")]
+)
+
+# Key filters as (estimated share of rows kept, column, code table)
+preds = []
 
 # Customers: only filter if user picked specific customers
 if sel_customers is not None:
-    mask &= df[CUSTOMER_COL].isin(sel_customers)
+    preds.append((len(sel_customers) / len(customer_options), CUSTOMER_COL, code_table(df[CUSTOMER_COL], sel_customers)))
 
 # Technicians: only filter if user picked specific techs
 if sel_techs is not None and TECH_COL and TECH_COL in df.columns:
-    mask &= df[TECH_COL].isin(sel_techs)
+    preds.append((len(sel_techs) / len(tech_options), TECH_COL, code_table(df[TECH_COL], sel_techs)))
 
 # Status: only filter if user picked a specific status
 if sel_status != "(All)":
-    mask &= (df[STATUS_COL] == sel_status)
-
-dff = df.loc[mask].copy()
+    preds.append((1 / len(df[STATUS_COL].cat.categories), STATUS_COL, code_table(df[STATUS_COL], [sel_status])))
+
+# Most selective first; each later predicate only reads the surviving rows
+idx = np.arange(lo, hi)
+for _, col, table in sorted(preds, key=lambda p: p[0]):
+    idx = idx[table[df[col].cat.codes.values[idx]]]
+
+# Row take (a copy of the selected rows); nothing below writes into dff, so no further .copy()
+dff = df.iloc[idx]
+
+# Identifies dff for cached aggregations (version of the loaded df + every filter value);
+# taken from load_data(), not the file on disk, which may be newer than the cached df
+filter_key = (
+    data_version,
+    d1,
+    d2,
+    tuple(sel_customers) if sel_customers is not None else None,
+    tuple(sel_techs) if sel_techs is not None else None,
+    sel_status,
+)
 
 # -------------------- Title + KPIs --------------------
 st.title("Service Calls Dashboard")
 
 k1, k2, k3 = st.columns(3)
 
-if CALL_ID_COL and CALL_ID_COL in dff.columns:
-    total_calls = dff[CALL_ID_COL].nunique()
+if CALL_ID_COL and CALL_ID_CODE_COL in dff.columns:
+    codes = dff[CALL_ID_CODE_COL].values
+    total_calls = np.unique(codes[codes >= 0]).size
 else:
     total_calls = len(dff)
 
+# One pass over STATUS; reused by the pie below
+status_vc = dff[STATUS_COL].value_counts().astype("int32")
+
 k1.metric("Total Calls", int(total_calls))
-k2.metric("Completed", int((dff[STATUS_COL] == "COMPLETED").sum()))
-k3.metric("Not Attended", int((dff[STATUS_COL] == "NOT ATTENDED").sum()))
+k2.metric("Completed", int(status_vc.get("COMPLETED", 0)))
+k3.metric("Not Attended", int(status_vc.get("NOT ATTENDED", 0)))
 
 # -------------------- Charts --------------------
 left, right = st.columns(2, gap="large")
 
 # For charts: when status is "(All)", show only the main 3 statuses (like your original)
-chart_base = dff.copy()
-if sel_status == "(All)":
-    chart_base = chart_base[chart_base[STATUS_COL].isin(status_order)].copy()
+# (status_vc says whether any other status is present; if not, skip the mask)
+chart_base = dff
+if sel_status == "(All)" and status_vc.drop(status_order, errors="ignore").any():
+    keep = code_table(dff[STATUS_COL], status_order)
+    chart_base = dff[keep[dff[STATUS_COL].cat.codes.values]]
 
 # ---------- PIE ----------
 with left:
     st.subheader("Call Status")
 
-    status_counts = (
-        chart_base[STATUS_COL]
-        .value_counts()
-        .reindex(status_order)
-        .fillna(0)
-        .reset_index()
-    )
-    status_counts.columns = ["STATUS", "COUNT"]
-
-    fig_pie = px.pie(
-        status_counts,
-        names="STATUS",
-        values="COUNT",
-        color="STATUS",
-        color_discrete_map=colors,
-        category_orders={"STATUS": status_order},
-    )
-    fig_pie.update_layout(
-        legend_title_text="",
-        legend=dict(font=dict(size=14)),
-        margin=dict(l=10, r=10, t=10, b=10),
-    )
-    st.plotly_chart(fig_pie, use_container_width=True)
+    # chart_base only drops statuses outside status_order, so the KPI counts cover it
+    status_counts = status_vc.reindex(status_order, fill_value=0).values
+
+    fig_pie = build_pie(tuple(status_order), tuple(status_counts.tolist()))
+    st.plotly_chart(fig_pie, use_container_width=True, key="status_pie")
 
 # ---------- CUSTOMER TREND ----------
 with right:
@@ -265,103 +526,75 @@ with right:
             label_visibility="collapsed",
         )
 
-    tmp = chart_base.copy()
+    tmp = chart_base
 
     if len(tmp) == 0:
         with chart_col:
             st.info("No data for the selected filters.")
     else:
+        # Day is the finest grain: count once per filter set, then roll up
+        daily = daily_status_counts(tmp, filter_key)
+        days = daily["DAY"].values
+
+        # Daily bars over more than ~3 months are unreadable and heavy to draw
+        if trend_mode == "Day" and days.max() - days.min() > np.timedelta64(92, "D"):
+            trend_mode = "Week"
+            with chart_col:
+                st.caption("Range is longer than 3 months, showing weeks instead of days.")
+
         if trend_mode == "Total":
-            tmp["PERIOD"] = "All"
+            period = "All"
             xorder = ["All"]
             tickvals, ticktext = xorder, xorder
         elif trend_mode == "Day":
-            tmp["PERIOD"] = tmp[DATE_COL].dt.date.astype(str)
-            xorder = sorted(tmp["PERIOD"].unique())
+            xorder, period = bucket_labels(days.astype("datetime64[D]"), "%Y-%m-%d")
             tickvals, ticktext = xorder, xorder
         elif trend_mode == "Week":
-            iso = tmp[DATE_COL].dt.isocalendar()
-            tmp["PERIOD"] = iso["year"].astype(str) + "-W" + iso["week"].astype(int).astype(str).str.zfill(2)
-            xorder = sorted(tmp["PERIOD"].unique())
+            # Bucket on the ISO week's Monday (day 0, 1970-01-01, was a Thursday)
+            day_i = days.astype("datetime64[D]").astype(np.int64)
+            mondays = (day_i - (day_i + 3) % 7).astype("datetime64[D]")
+            xorder, period = bucket_labels(mondays, "%G-W%V")
             tickvals, ticktext = xorder, xorder
         else:  # Month
-            tmp["PERIOD"] = tmp[DATE_COL].dt.to_period("M").astype(str)
-            xorder = sorted(tmp["PERIOD"].unique())
+            xorder, period = bucket_labels(days.astype("datetime64[M]"), "%Y-%m")
             tickvals = xorder
-            ticktext = [pd.to_datetime(p + "-01").strftime("%b") for p in xorder]
-
-        grp = tmp.groupby(["PERIOD", STATUS_COL]).size().reset_index(name="COUNT")
-
-        fig_stack = px.bar(
-            grp,
-            x="PERIOD",
-            y="COUNT",
-            color=STATUS_COL,
-            barmode="stack",
-            color_discrete_map=colors,
-            category_orders={"PERIOD": xorder, STATUS_COL: status_order},
-        )
+            ticktext = pd.to_datetime(xorder, format="%Y-%m").strftime("%b").tolist()
 
-        fig_stack.update_layout(
-            legend_title_text="",
-            legend=dict(font=dict(size=14)),
-            margin=dict(l=10, r=10, t=10, b=10),
+        # period x status matrix: the grouped sums reshaped, not re-aggregated
+        period_status = (
+            pd.DataFrame({"PERIOD": period, STATUS_COL: daily[STATUS_COL].values, "COUNT": daily["COUNT"].values})
+            .groupby(["PERIOD", STATUS_COL], observed=True, sort=False)["COUNT"]
+            .sum()
+            .unstack(STATUS_COL, fill_value=0)
         )
-        fig_stack.update_xaxes(
-            categoryorder="array",
-            categoryarray=xorder,
-            tickmode="array",
-            tickvals=tickvals,
-            ticktext=ticktext,
-            title_text="",
+
+        fig_stack = build_trend(
+            matrix_traces(period_status, status_order), tuple(xorder), tuple(tickvals), tuple(ticktext)
         )
-        fig_stack.update_yaxes(title_text="Count")
 
         with chart_col:
-            st.plotly_chart(fig_stack, use_container_width=True)
+            st.plotly_chart(fig_stack, use_container_width=True, key="status_trend")
 
 # -------------------- Technician Performance --------------------
 st.markdown("## Technician Performance (Sorted by Completion Rate)")
 
 if TECH_COL and TECH_COL in dff.columns:
-    tech_df = chart_base.copy()
+    tech_df = chart_base
 
     if len(tech_df) == 0:
         st.info("No technician data for the selected filters.")
     else:
-        tech_counts = tech_df.groupby([TECH_COL, STATUS_COL]).size().reset_index(name="COUNT")
-
-        totals = tech_counts.groupby(TECH_COL)["COUNT"].sum().rename("TOTAL")
-        completed = (
-            tech_counts[tech_counts[STATUS_COL] == "COMPLETED"]
-            .groupby(TECH_COL)["COUNT"]
-            .sum()
-            .rename("COMPLETED")
-        )
-
-        rates = pd.concat([totals, completed], axis=1).fillna(0)
-        rates["COMP_RATE"] = rates["COMPLETED"] / rates["TOTAL"].where(rates["TOTAL"] != 0, 1)
-        order = rates.sort_values("COMP_RATE", ascending=False).index.tolist()
-
-        fig_tech = px.bar(
-            tech_counts,
-            y=TECH_COL,
-            x="COUNT",
-            color=STATUS_COL,
-            barmode="stack",
-            orientation="h",
-            color_discrete_map=colors,
-            category_orders={TECH_COL: order, STATUS_COL: status_order},
-        )
-        fig_tech.update_layout(
-            legend_title_text="",
-            legend=dict(font=dict(size=14)),
-            margin=dict(l=10, r=10, t=10, b=10),
-            yaxis_title="",
-            xaxis_title="Count",
-        )
-        st.plotly_chart(fig_tech, use_container_width=True)
+        traces, order = tech_chart_inputs(tech_df, filter_key, tuple(status_order))
+        fig_tech = build_tech(traces, order)
+        st.plotly_chart(fig_tech, use_container_width=True, key="tech_bars")
 
 # -------------------- Show Data --------------------
 with st.expander("Show data"):
-    st.dataframe(dff, use_container_width=True)
+    # Only ship a head of the table to the browser; widen on demand
+    n_rows = st.number_input("Rows to show", min_value=100, value=500, step=100)
+    st.caption(f"Showing {min(int(n_rows), len(dff)):,} of {len(dff):,} rows")
+    st.dataframe(
+        dff.head(int(n_rows)),
+        use_container_width=True,
+        column_config={CALL_ID_CODE_COL: None},  # internal helper column
+    )